@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+################################################################################
+# radix_sort.py
+# SPDX-License-Identifier: GNU GPL v3.0
+################################################################################
+"""
+Sorting engine that picks a specialized, non-comparison sort based on the
+type of the input items, in non-decreasing (ascending) or non-increasing
+(descending) sort order:
+
+ - int   : LSD radix sort, 8-bits per pass, on keys offset by the min value
+           (so negative numbers are handled). Only for fixed-width keys, of
+           up to 64 bits; wider ints fall back to insertion sort.
+ - float : LSD radix sort on the IEEE-754 64-bit pattern, with bits flipped so
+           that unsigned integer order matches floating-point order. -0.0 and
+           0.0 are equal keys, as in insertion_sort(). NaNs, which have no
+           place in float order, sort last when ascending, first when
+           descending.
+ - str   : MSD radix sort on the UTF-8 encoding, falling back to insertion
+   bytes   sort for short buckets.
+
+Sub-classes of these types, and other numbers.Integral types, e.g. IntEnum
+or NumPy int64, are handled too. The engines move the input items, not
+decoded keys, so the output holds the same objects as the input. Like
+insertion_sort(), all engines are stable, in both sort orders.
+
+Inputs of mixed or other types fall back to the generic insertion_sort().
+
+Ref: CLRS Sec 8.3, Radix sort.
+"""
+import sys
+import os
+import enum
+import math
+import numbers
+import random
+import struct
+import time
+import argparse
+
+from insertion_sort import insertion_sort, check_list
+from insertion_sort import SORT_ASC, SORT_DESC, IS_DESC
+
+###############################################################################
+# Global Variables: Used in multiple places. List here for documentation
+###############################################################################
+
+THIS_SCRIPT          = os.path.basename(__file__)
+
+# Each LSD radix pass sorts on one byte of the key.
+RADIX_BITS = 8
+RADIX      = (1 << RADIX_BITS)
+RADIX_MASK = (RADIX - 1)
+
+# Widest int key, in bits, that is sorted by LSD radix sort. Number of passes
+# grows with the width of the keys, so arbitrarily large ints go the generic way.
+INT_KEY_MAX_BITS = 64
+
+# Buckets with fewer than these many items are handed off to insertion sort
+# by the MSD radix sort.
+MSD_CUTOFF = 16
+
+# Masks to map the IEEE-754 bit pattern of a double to an order-preserving key
+FLOAT_SIGN_BIT = (1 << 63)
+FLOAT_ALL_BITS = ((1 << 64) - 1)
+
+# Names of key types that the engine knows how to handle
+KEY_INT     = 'int'
+KEY_FLOAT   = 'float'
+KEY_STR     = 'str'
+KEY_BYTES   = 'bytes'
+KEY_GENERIC = 'generic'
+
+# pylint: disable-msg=superfluous-parens
+###############################################################################
+# main() driver
+###############################################################################
+def main():
+    """
+    Shell to call do_main() with command-line arguments.
+    """
+    do_main(sys.argv[1:])
+
+###############################################################################
+def do_main(args) -> (bool, int, int, str):
+    """
+    Main driver to implement argument processing.
+    """
+    parsed_args = parse_args(args)
+
+    # Extract parsed cmdline flags into local variables
+    benchmark        = parsed_args.benchmark
+    num_items        = int(parsed_args.num_items)
+    verbose          = parsed_args.verbose
+    do_debug         = parsed_args.debug_script
+    dump_flag        = parsed_args.dump_flags
+
+    if dump_flag:
+        print(f'benchmark = {benchmark}')
+        print(f'num_items = {num_items}')
+        print(f'verbose = {verbose}')
+        print(f'do_debug = {do_debug}')
+
+    if benchmark:
+        run_benchmarks(num_items)
+
+    sys.exit(0)
+
+###############################################################################
+def radix_sort(inplist:list, asc:bool = SORT_ASC) -> list:
+    """Sort input list using the engine best suited to the type of its items"""
+    if len(inplist) == 0:
+        return []
+
+    key_type = detect_key_type(inplist)
+    if key_type == KEY_INT:
+        return lsd_radix_sort_ints(inplist, asc)
+    if key_type == KEY_FLOAT:
+        return lsd_radix_sort_floats(inplist, asc)
+    if key_type == KEY_STR:
+        return msd_radix_sort_strs(inplist, asc)
+    if key_type == KEY_BYTES:
+        return msd_radix_sort_bytes(inplist, asc)
+    return insertion_sort(inplist, asc)
+
+###############################################################################
+def detect_key_type(inplist:list) -> str:
+    """
+    Return the name of the key type if all items are of one known type.
+    Sub-classes of int, float, str and bytes, and other numbers.Integral
+    types, are matched. Ints wider than INT_KEY_MAX_BITS, after offsetting
+    by the min value, are reported as generic.
+    """
+    first_type = type(inplist[0])
+    for item in inplist:
+        if type(item) is not first_type:    # pylint: disable=unidiomatic-typecheck
+            return KEY_GENERIC
+
+    # Note: bool is a sub-class of int, and is deliberately not matched here.
+    if first_type is bool:
+        return KEY_GENERIC
+
+    if issubclass(first_type, numbers.Integral):
+        # Convert to int, so fixed-width types, e.g. NumPy int64, do not overflow
+        if (int(max(inplist)) - int(min(inplist))).bit_length() > INT_KEY_MAX_BITS:
+            return KEY_GENERIC
+        return KEY_INT
+
+    for (base_type, key_type) in (  (float, KEY_FLOAT)
+                                  , (str,   KEY_STR)
+                                  , (bytes, KEY_BYTES)):
+        if issubclass(first_type, base_type):
+            return key_type
+    return KEY_GENERIC
+
+###############################################################################
+def lsd_radix_sort_ints(inplist:list, asc:bool = SORT_ASC) -> list:
+    """
+    LSD radix sort of integers.
+
+    Keys are offset by the min value so that all keys are non-negative; the
+    number of passes is fixed by the bit-width of the largest offset key,
+    which the caller limits to INT_KEY_MAX_BITS. For descending order, keys
+    are instead offset from the max value, so larger items get smaller keys.
+    """
+    if asc:
+        minval = int(min(inplist))
+        entries = [((int(item) - minval), item) for item in inplist]
+    else:
+        maxval = int(max(inplist))
+        entries = [((maxval - int(item)), item) for item in inplist]
+    nbits = max(key for (key, _) in entries).bit_length()
+
+    return [item for (_, item) in _lsd_radix_passes(entries, nbits)]
+
+###############################################################################
+def lsd_radix_sort_floats(inplist:list, asc:bool = SORT_ASC) -> list:
+    """
+    LSD radix sort of floats.
+
+    The 64-bit IEEE-754 pattern of each float is mapped to an unsigned key:
+    for negative numbers all bits are flipped, for positive numbers only the
+    sign bit is flipped. Unsigned order of the keys then matches float order.
+    -0.0 is given the key of 0.0, and all NaNs, of either sign, map to the
+    largest key. For descending order, the keys are complemented.
+    """
+    if asc:
+        entries = [(_float_to_key(item), item) for item in inplist]
+    else:
+        entries = [((FLOAT_ALL_BITS - _float_to_key(item)), item) for item in inplist]
+
+    return [item for (_, item) in _lsd_radix_passes(entries, 64)]
+
+###############################################################################
+def msd_radix_sort_strs(inplist:list, asc:bool = SORT_ASC) -> list:
+    """
+    MSD radix sort of strings.
+
+    UTF-8 encoding preserves code-point order, so the strings are sorted
+    on their encoded bytes.
+    """
+    entries = [(item.encode('utf-8', 'surrogatepass'), item) for item in inplist]
+    return [item for (_, item) in _msd_radix_sort(entries, asc)]
+
+###############################################################################
+def msd_radix_sort_bytes(inplist:list, asc:bool = SORT_ASC) -> list:
+    """MSD radix sort of bytes."""
+    entries = [(item, item) for item in inplist]
+    return [item for (_, item) in _msd_radix_sort(entries, asc)]
+
+###############################################################################
+def check_sorted_same(inplist:list, outlist:list, asc:bool = SORT_ASC) -> bool:
+    """Verify that the output list is the input list, sorted in right order"""
+    return (outlist == sorted(inplist, reverse=(not asc)))
+
+###############################################################################
+# Benchmarking routines
+###############################################################################
+
+def run_benchmarks(num_items:int):
+    """Time the specialized engines against the generic insertion sort"""
+    datasets = {  KEY_INT   : random.sample(range(-10000000, 10000000), k=num_items)
+                , KEY_FLOAT : [random.uniform(-1e6, 1e6) for _ in range(num_items)]
+                , KEY_STR   : [gen_random_str(random.randint(1, 20))
+                               for _ in range(num_items)]
+                , KEY_BYTES : [os.urandom(random.randint(1, 20))
+                               for _ in range(num_items)]
+               }
+
+    print(f'Benchmark: {num_items} items, time in milliseconds')
+    print(f'{"key-type":<8} {"order":<5} {"generic":>10} {"radix":>10} {"speedup":>8}')
+    print(f'{"--------":<8} {"-----":<5} {"-------":>10} {"-----":>10} {"-------":>8}')
+    for key_type, dataset in datasets.items():
+        for asc in (SORT_ASC, SORT_DESC):
+            generic_ms = time_sort_ms(insertion_sort, dataset, asc)
+            radix_ms = time_sort_ms(radix_sort, dataset, asc)
+            speedup = (generic_ms / radix_ms) if radix_ms > 0 else 0
+            order = 'asc' if asc else 'desc'
+            print(f'{key_type:<8} {order:<5} {generic_ms:>10.2f} {radix_ms:>10.2f}'
+                  + f' {speedup:>7.1f}x')
+
+# -----
+def time_sort_ms(sort_fn, inplist:list, asc:bool) -> float:
+    """Return elapsed time, in milliseconds, to sort the input list"""
+    start = time.perf_counter()
+    sort_fn(inplist, asc)
+    return (time.perf_counter() - start) * 1000
+
+# -----
+def gen_random_str(length:int) -> str:
+    """Generate random string, mostly ASCII with an occasional wide char"""
+    alphabet = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJ0123456789 éß€😀'
+    return ''.join(random.choices(alphabet, k=length))
+
+###############################################################################
+# Argument Parsing routine
+def parse_args(args):
+    """
+    Command-line argument parser.
+
+    For how-to re-work argument parsing so it's testable.
+    """
+    # pylint: disable-msg=line-too-long
+    # Ref: https://stackoverflow.com/questions/18160078/how-do-you-write-tests-for-the-argparse-portion-of-a-python-module
+    # pylint: enable-msg=line-too-long
+
+    # ---------------------------------------------------------------
+    # Start of argument parser, with inline examples text
+    # Create 'parser' as object of type ArgumentParser
+    parser  = argparse.ArgumentParser(description='Radix Sort engine',
+                                      formatter_class=argparse.RawDescriptionHelpFormatter,
+                                      epilog=f'''Examples:
+
+- Benchmark against generic insertion sort:
+    {THIS_SCRIPT} --benchmark --num-items 2000 ''')
+
+    # Define arguments supported by this script
+    parser.add_argument('--benchmark', dest='benchmark'
+                        , action='store_true'
+                        , default=False
+                        , help='Time radix sort engines against insertion sort')
+
+    parser.add_argument('--num-items', dest='num_items'
+                        , metavar='<number>'
+                        , default=2000
+                        , help='Number of items to sort, for benchmarking')
+
+    # ======================================================================
+    # Debugging support
+    parser.add_argument('--verbose', dest='verbose'
+                        , action='store_true'
+                        , default=False
+                        , help='Show verbose progress messages')
+
+    parser.add_argument('--debug', dest='debug_script'
+                        , action='store_true'
+                        , default=False
+                        , help='Turn on debugging for script\'s execution')
+
+    parser.add_argument('--dump-data', dest='dump_flags'
+                        , action='store_true'
+                        , default=False
+                        , help='Dump args, other data for debugging')
+
+    parsed_args = parser.parse_args(args)
+
+    if parsed_args is False:
+        parser.print_help()
+
+    return parsed_args
+
+###############################################################################
+# Helper methods
+###############################################################################
+
+def _lsd_radix_passes(entries:list, nbits:int) -> list:
+    """
+    Stable bucket-sort of (key, item) entries, on non-negative int keys,
+    one byte per pass.
+    """
+    shift = 0
+    while shift < nbits:
+        buckets = [[] for _ in range(RADIX)]
+        for entry in entries:
+            buckets[(entry[0] >> shift) & RADIX_MASK].append(entry)
+        entries = [entry for bucket in buckets for entry in bucket]
+        shift += RADIX_BITS
+    return entries
+
+# -----
+def _float_to_key(fval:float) -> int:
+    """Map a float to an unsigned 64-bit key with the same ordering"""
+    if fval != fval:    # NaN
+        return FLOAT_ALL_BITS
+    if fval == 0.0:     # -0.0 and 0.0 compare equal, so give them the same key
+        return FLOAT_SIGN_BIT
+
+    bits = struct.unpack('>Q', struct.pack('>d', fval))[0]
+    if bits & FLOAT_SIGN_BIT:
+        return (bits ^ FLOAT_ALL_BITS)
+    return (bits | FLOAT_SIGN_BIT)
+
+# -----
+def _msd_radix_sort(entries:list, asc:bool = SORT_ASC) -> list:
+    """
+    MSD radix sort of (key-bytes, item) entries, in asc/desc order of keys.
+
+    Uses an explicit stack of (entries, depth) work items, rather than
+    recursion, so long common prefixes do not exhaust the recursion limit.
+    Finished buckets are emitted in order, so the stack is processed LIFO,
+    with the buckets pushed in reverse of the sort order. A depth of None
+    marks entries that are already in their final order.
+    """
+    outlist = []
+    stack = [(entries, 0)]
+    while stack:
+        (bucket, depth) = stack.pop()
+        if depth is None:
+            outlist.extend(bucket)
+            continue
+
+        if len(bucket) < MSD_CUTOFF:
+            # All keys in this bucket share the same prefix up to 'depth',
+            # so comparing whole entries orders them correctly.
+            outlist.extend(insertion_sort(bucket, asc))
+            continue
+
+        # Keys that end at this depth sort before all longer keys.
+        ended = []
+        buckets = [[] for _ in range(RADIX)]
+        for entry in bucket:
+            key = entry[0]
+            if depth < len(key):
+                buckets[key[depth]].append(entry)
+            else:
+                ended.append(entry)
+
+        if not asc:
+            stack.append((ended, None))
+            buckets.reverse()
+
+        for sub_bucket in reversed(buckets):
+            if sub_bucket:
+                stack.append((sub_bucket, depth + 1))
+
+        if asc:
+            stack.append((ended, None))
+    return outlist
+
+###############################################################################
+def test_basic():
+    """ Run all the built-in basic unit-tests with small data sets """
+    assert radix_sort([]) == []
+    assert radix_sort([5]) == [5]
+    assert check_list(radix_sort([1, 2, 3, 4, 5]))
+    assert check_list(radix_sort([3, 2, 1, 0 ]))
+    assert check_list(radix_sort([3, 2, 1, 0 ], SORT_DESC), IS_DESC)
+
+# -----
+def test_detect_key_type():
+    """Unit-tests to verify selection of the sort engine by item type"""
+    assert detect_key_type([1, -2, 3]) == KEY_INT
+    assert detect_key_type([1.0, -2.5]) == KEY_FLOAT
+    assert detect_key_type(['a', 'bc']) == KEY_STR
+    assert detect_key_type([b'a', b'bc']) == KEY_BYTES
+    assert detect_key_type([1, 2.0]) == KEY_GENERIC
+    assert detect_key_type([True, False]) == KEY_GENERIC
+    assert detect_key_type([(1, 2), (0, 1)]) == KEY_GENERIC
+
+# -----
+def test_sort_ints_with_neg_nos():
+    """Unit-tests to verify sorting of integers, including negative numbers"""
+    inplist = random.sample(range(-10000000, 10000000), k=2000)
+    assert check_sorted_same(inplist, radix_sort(inplist))
+    assert check_sorted_same(inplist, radix_sort(inplist, SORT_DESC), SORT_DESC)
+
+    inplist = [0, -1, 2**70, -2**70, 5, 5, -1]
+    assert check_sorted_same(inplist, radix_sort(inplist))
+
+# -----
+def test_sort_wide_ints():
+    """Unit-tests to verify that ints wider than 64-bits use insertion sort"""
+    inplist = [-2**63, 2**63 - 1, 0, -1]
+    assert detect_key_type(inplist) == KEY_INT
+    assert check_sorted_same(inplist, radix_sort(inplist))
+
+    inplist = [0, 2**64, 5]
+    assert detect_key_type(inplist) == KEY_GENERIC
+
+    inplist = [0, 2**20000, 5] * 10
+    assert detect_key_type(inplist) == KEY_GENERIC
+    assert check_sorted_same(inplist, radix_sort(inplist))
+    assert check_sorted_same(inplist, radix_sort(inplist, SORT_DESC), SORT_DESC)
+
+# -----
+def test_sort_floats():
+    """Unit-tests to verify sorting of floats, including special values"""
+    inplist = [random.uniform(-1e6, 1e6) for _ in range(2000)]
+    assert check_sorted_same(inplist, radix_sort(inplist))
+    assert check_sorted_same(inplist, radix_sort(inplist, SORT_DESC), SORT_DESC)
+
+    inplist = [1.5, float('inf'), -0.5, 0.0, float('-inf'), 1e-310, -1e-310, 2.0]
+    assert check_sorted_same(inplist, radix_sort(inplist))
+
+    # Signed zeros are equal keys, and keep input order, as in insertion_sort()
+    inplist = [0.0, -0.0, 1.0, 0.0, -0.0]
+    for asc in (SORT_ASC, SORT_DESC):
+        outlist = radix_sort(inplist, asc)
+        expected = insertion_sort(inplist, asc)
+        assert ([math.copysign(1, fval) for fval in outlist]
+                == [math.copysign(1, fval) for fval in expected])
+
+    # NaNs, of either sign, sort last when ascending and first when descending
+    nan = float('nan')
+    neg_nan = math.copysign(nan, -1)
+    inplist = [1.0, nan, -1.0, float('-inf'), neg_nan, float('inf')]
+    outlist = radix_sort(inplist)
+    assert outlist[:4] == [float('-inf'), -1.0, 1.0, float('inf')]
+    assert (outlist[4] is nan) and (outlist[5] is neg_nan)
+
+    outlist = radix_sort(inplist, SORT_DESC)
+    assert (outlist[0] is nan) and (outlist[1] is neg_nan)
+    assert outlist[2:] == [float('inf'), 1.0, -1.0, float('-inf')]
+
+# -----
+def test_sort_keeps_items():
+    """
+    Unit-tests to verify that sub-classes of the key types are sorted, and
+    that the output holds the input objects, in the same stable order as
+    insertion_sort().
+    """
+    class Color(enum.IntEnum):
+        """Int sub-class, with its own type in the sorted output"""
+        RED = 3
+        GREEN = 1
+        BLUE = 2
+
+    class Price(float):
+        """Float sub-class, with its own type in the sorted output"""
+
+    class Name(str):
+        """Str sub-class, with its own type in the sorted output"""
+
+    inplists = [  list(Color) * 6
+                , [Price(random.choice([-1.5, 0.0, -0.0, 2.5])) for _ in range(50)]
+                , [Name(random.choice(['ab', 'a', 'b', ''])) for _ in range(50)]
+               ]
+    for inplist in inplists:
+        assert detect_key_type(inplist) != KEY_GENERIC
+        for asc in (SORT_ASC, SORT_DESC):
+            outlist = radix_sort(inplist, asc)
+            expected = insertion_sort(inplist, asc)
+            assert all((out is exp) for (out, exp) in zip(outlist, expected))
+            assert len(outlist) == len(expected)
+
+# -----
+def test_sort_strs():
+    """Unit-tests to verify sorting of strings, including non-ASCII chars"""
+    inplist = [gen_random_str(random.randint(0, 20)) for _ in range(2000)]
+    assert check_sorted_same(inplist, radix_sort(inplist))
+    assert check_sorted_same(inplist, radix_sort(inplist, SORT_DESC), SORT_DESC)
+
+    # Long common prefixes, and prefixes of other keys
+    inplist = [('x' * 5000) + str(idx) for idx in range(100)] + ['x', '', 'x' * 5000]
+    assert check_sorted_same(inplist, radix_sort(inplist))
+
+# -----
+def test_sort_bytes():
+    """Unit-tests to verify sorting of bytes"""
+    inplist = [os.urandom(random.randint(0, 20)) for _ in range(2000)]
+    assert check_sorted_same(inplist, radix_sort(inplist))
+    assert check_sorted_same(inplist, radix_sort(inplist, SORT_DESC), SORT_DESC)
+
+# -----
+def test_sort_generic_fallback():
+    """Unit-tests to verify that mixed-type inputs use insertion sort"""
+    inplist = [3, 1.5, -2, 0.25]
+    assert check_sorted_same(inplist, radix_sort(inplist))
+    assert check_sorted_same(inplist, radix_sort(inplist, SORT_DESC), SORT_DESC)
+
+###############################################################################
+# Start of the script: Execute only if run as a script
+###############################################################################
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+################################################################################
+# sort_mem_profile.py
+# SPDX-License-Identifier: GNU GPL v3.0
+################################################################################
+"""
+Memory-footprint instrumentation for the sort kernels, using tracemalloc.
+
+ --mem-profile    : Report peak and net allocation of each sort kernel, for
+                    each input representation (list, array.array, NumPy, mmap)
+ --bytes-per-elem : Report bytes per element of each input representation,
+                    to help choose the representation for a dataset size.
+
+NumPy is optional; its representation is skipped if NumPy is not installed.
+The CI workflow installs it, from requirements.txt, so the NumPy path is
+tested there.
+
+Ref: https://docs.python.org/3/library/tracemalloc.html
+"""
+import sys
+import os
+import mmap
+import random
+import argparse
+import tracemalloc
+from array import array
+
+from insertion_sort import insertion_sort, check_list
+from radix_sort import radix_sort, detect_key_type
+from radix_sort import KEY_INT, KEY_GENERIC
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+###############################################################################
+# Global Variables: Used in multiple places. List here for documentation
+###############################################################################
+
+THIS_SCRIPT          = os.path.basename(__file__)
+
+# Type-code of array.array, and item format of mmap'ed buffers: signed 64-bit
+ARRAY_TYPECODE = 'q'
+
+# Names of input representations that we know about
+REPR_LIST  = 'list'
+REPR_ARRAY = 'array.array'
+REPR_NUMPY = 'numpy'
+REPR_MMAP  = 'mmap'
+
+# Names of sort kernels that we know about
+KERNEL_INSERTION = 'insertion_sort'
+KERNEL_RADIX     = 'radix_sort'
+
+# pylint: disable-msg=superfluous-parens
+###############################################################################
+# main() driver
+###############################################################################
+def main():
+    """
+    Shell to call do_main() with command-line arguments.
+    """
+    do_main(sys.argv[1:])
+
+###############################################################################
+def do_main(args) -> (bool, int, int, str):
+    """
+    Main driver to implement argument processing.
+    """
+    parsed_args = parse_args(args)
+
+    # Extract parsed cmdline flags into local variables
+    mem_profile      = parsed_args.mem_profile
+    bytes_per_elem   = parsed_args.bytes_per_elem
+    num_items        = int(parsed_args.num_items)
+    verbose          = parsed_args.verbose
+    do_debug         = parsed_args.debug_script
+    dump_flag        = parsed_args.dump_flags
+
+    if dump_flag:
+        print(f'mem_profile = {mem_profile}')
+        print(f'bytes_per_elem = {bytes_per_elem}')
+        print(f'num_items = {num_items}')
+        print(f'verbose = {verbose}')
+        print(f'do_debug = {do_debug}')
+
+    if np is None and (mem_profile or bytes_per_elem):
+        print(f'Note: NumPy is not installed; skipping \'{REPR_NUMPY}\' representation.')
+
+    values = gen_values(num_items)
+    if mem_profile:
+        pr_mem_profile(values)
+
+    if bytes_per_elem:
+        pr_bytes_per_elem(values)
+
+    sys.exit(0)
+
+###############################################################################
+def measure_alloc(func, *args) -> (object, int, int):
+    """
+    Call func(*args) under tracemalloc, and return its result, the peak
+    allocation while it ran, and the net allocation still held after it
+    returned, in bytes. Both are relative to the traced memory at entry.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    tracemalloc.reset_peak()
+    (start_bytes, _) = tracemalloc.get_traced_memory()
+    result = func(*args)
+    (end_bytes, peak_bytes) = tracemalloc.get_traced_memory()
+
+    if not was_tracing:
+        tracemalloc.stop()
+    return (result, (peak_bytes - start_bytes), (end_bytes - start_bytes))
+
+###############################################################################
+def make_list(values:array) -> list:
+    """Build list of boxed ints"""
+    return values.tolist()
+
+# -----
+def make_array(values:array) -> array:
+    """Build array.array of packed signed 64-bit ints"""
+    return array(ARRAY_TYPECODE, values)
+
+# -----
+def make_numpy(values:array):
+    """Build NumPy array of signed 64-bit ints"""
+    return np.array(values, dtype=np.int64)
+
+# -----
+def make_mmap(values:array) -> memoryview:
+    """
+    Build an anonymous mmap of packed signed 64-bit ints, returned as a
+    memoryview so that it can be indexed like the other representations.
+    """
+    packed = values.tobytes()
+    mapped = mmap.mmap(-1, max(len(packed), 1))
+    mapped[:len(packed)] = packed
+
+    # The mapping is not closed here: the returned memoryview keeps it alive,
+    # and it is unmapped once the last view on it is released.
+    return memoryview(mapped)[:len(packed)].cast(ARRAY_TYPECODE)
+
+###############################################################################
+def gen_values(num_items:int) -> array:
+    """
+    Generate random data set, including negative numbers. It is kept packed
+    so that each representation built from it owns its own int objects.
+    """
+    return array(ARRAY_TYPECODE, random.sample(range(-10000000, 10000000), k=num_items))
+
+###############################################################################
+def get_repr_builders() -> dict:
+    """Return hash of representation name to its builder method"""
+    builders = {  REPR_LIST  : make_list
+                , REPR_ARRAY : make_array
+                , REPR_MMAP  : make_mmap
+               }
+    if np is not None:
+        builders[REPR_NUMPY] = make_numpy
+    return builders
+
+# Hash of sort kernels to profile
+Sort_kernels = {  KERNEL_INSERTION : insertion_sort
+                , KERNEL_RADIX     : radix_sort
+               }
+
+###############################################################################
+def kernel_engine(kernel_name:str, rep) -> str:
+    """
+    Return name of the engine that the sort kernel actually runs for this
+    input, so a fallback to the generic insertion sort shows up in reports.
+    """
+    if (kernel_name == KERNEL_RADIX) and (len(rep) > 0):
+        return detect_key_type(rep)
+    return KEY_GENERIC
+
+###############################################################################
+def untraced_bytes(rep) -> int:
+    """
+    Bytes of a representation that tracemalloc does not see. mmap'ed pages
+    are not allocated via malloc(), so count the size of the mapping, rounded
+    up to whole pages as mapped by the OS.
+    """
+    if isinstance(rep, memoryview) and isinstance(rep.obj, mmap.mmap):
+        npages = -(-len(rep.obj) // mmap.PAGESIZE)
+        return (npages * mmap.PAGESIZE)
+    return 0
+
+# -----
+def bytes_per_elem_table(values:array) -> dict:
+    """Return hash of representation name to its bytes per element"""
+    result = {}
+    for rep_name, builder in get_repr_builders().items():
+        (rep, _, net_bytes) = measure_alloc(builder, values)
+        total_bytes = net_bytes + untraced_bytes(rep)
+        result[rep_name] = (total_bytes / len(values)) if values else 0
+    return result
+
+# -----
+def mem_profile_table(values:array) -> list:
+    """
+    Return list of (kernel, representation, engine, peak-bytes, net-bytes)
+    of sorting the values in each representation with each sort kernel.
+    """
+    result = []
+    for kernel_name, kernel in Sort_kernels.items():
+        for rep_name, builder in get_repr_builders().items():
+            rep = builder(values)
+            engine = kernel_engine(kernel_name, rep)
+            (_, peak_bytes, net_bytes) = measure_alloc(kernel, rep)
+            result.append((kernel_name, rep_name, engine, peak_bytes, net_bytes))
+    return result
+
+###############################################################################
+def pr_mem_profile(values:array):
+    """Print peak and net allocation of each sort kernel, per representation"""
+    print(f'Memory profile: sort {len(values)} items, allocation in bytes')
+    print(f'{"kernel":<15} {"repr":<12} {"engine":<8} {"peak":>12} {"net":>12}'
+          + f' {"peak/elem":>10}')
+    print(f'{"------":<15} {"----":<12} {"------":<8} {"----":>12} {"---":>12}'
+          + f' {"---------":>10}')
+    for (kernel_name, rep_name, engine, peak_bytes, net_bytes) in mem_profile_table(values):
+        per_elem = (peak_bytes / len(values)) if values else 0
+        print(f'{kernel_name:<15} {rep_name:<12} {engine:<8} {peak_bytes:>12}'
+              + f' {net_bytes:>12} {per_elem:>10.1f}')
+
+# -----
+def pr_bytes_per_elem(values:array):
+    """Print bytes per element of each input representation"""
+    print(f'Footprint: {len(values)} items, in bytes')
+    print(f'{"repr":<12} {"bytes/elem":>10} {"total":>12}')
+    print(f'{"----":<12} {"----------":>10} {"-----":>12}')
+    for rep_name, per_elem in bytes_per_elem_table(values).items():
+        print(f'{rep_name:<12} {per_elem:>10.1f} {int(per_elem * len(values)):>12}')
+
+###############################################################################
+# Argument Parsing routine
+def parse_args(args):
+    """
+    Command-line argument parser.
+
+    For how-to re-work argument parsing so it's testable.
+    """
+    # pylint: disable-msg=line-too-long
+    # Ref: https://stackoverflow.com/questions/18160078/how-do-you-write-tests-for-the-argparse-portion-of-a-python-module
+    # pylint: enable-msg=line-too-long
+
+    # ---------------------------------------------------------------
+    # Start of argument parser, with inline examples text
+    # Create 'parser' as object of type ArgumentParser
+    parser  = argparse.ArgumentParser(description='Memory profile of sort kernels',
+                                      formatter_class=argparse.RawDescriptionHelpFormatter,
+                                      epilog=f'''Examples:
+
+- Peak / net allocation of each sort kernel and input representation:
+    {THIS_SCRIPT} --mem-profile --num-items 2000
+
+- Bytes per element of each input representation:
+    {THIS_SCRIPT} --bytes-per-elem --num-items 1000000 ''')
+
+    # Define arguments supported by this script
+    parser.add_argument('--mem-profile', dest='mem_profile'
+                        , action='store_true'
+                        , default=False
+                        , help='Report peak and net allocation of each sort kernel')
+
+    parser.add_argument('--bytes-per-elem', dest='bytes_per_elem'
+                        , action='store_true'
+                        , default=False
+                        , help='Report bytes per element of each input representation')
+
+    parser.add_argument('--num-items', dest='num_items'
+                        , metavar='<number>'
+                        , default=2000
+                        , help='Number of items in the data set')
+
+    # ======================================================================
+    # Debugging support
+    parser.add_argument('--verbose', dest='verbose'
+                        , action='store_true'
+                        , default=False
+                        , help='Show verbose progress messages')
+
+    parser.add_argument('--debug', dest='debug_script'
+                        , action='store_true'
+                        , default=False
+                        , help='Turn on debugging for script\'s execution')
+
+    parser.add_argument('--dump-data', dest='dump_flags'
+                        , action='store_true'
+                        , default=False
+                        , help='Dump args, other data for debugging')
+
+    parsed_args = parser.parse_args(args)
+
+    if parsed_args is False:
+        parser.print_help()
+
+    return parsed_args
+
+###############################################################################
+def test_measure_alloc():
+    """Unit-tests to verify peak and net allocation reported by tracemalloc"""
+    (result, peak_bytes, net_bytes) = measure_alloc(lambda n: [0] * n, 10000)
+    assert len(result) == 10000
+    assert net_bytes >= (10000 * 8)
+    assert peak_bytes >= net_bytes
+
+    # Temporary allocations show up in the peak, but not in the net
+    (_, peak_bytes, net_bytes) = measure_alloc(lambda n: len([0] * n), 10000)
+    assert peak_bytes >= (10000 * 8)
+    assert net_bytes < (10000 * 8)
+    assert not tracemalloc.is_tracing()
+
+# -----
+def test_reprs_sort():
+    """Unit-tests to verify that sort kernels work on every representation"""
+    values = gen_values(200)
+    for kernel in Sort_kernels.values():
+        for builder in get_repr_builders().values():
+            outlist = kernel(builder(values))
+            assert check_list(outlist)
+            assert len(outlist) == len(values)
+
+# -----
+def test_bytes_per_elem():
+    """Unit-tests to verify that packed representations are compact"""
+    per_elem = bytes_per_elem_table(gen_values(10000))
+    assert per_elem[REPR_ARRAY] < per_elem[REPR_LIST]
+    assert per_elem[REPR_MMAP] >= 8
+    assert 8 <= per_elem[REPR_ARRAY] < 10
+
+    # mmap footprint is counted in whole pages
+    rep = make_mmap(gen_values(2000))
+    assert untraced_bytes(rep) == -(-(2000 * 8) // mmap.PAGESIZE) * mmap.PAGESIZE
+    assert untraced_bytes(make_list(gen_values(10))) == 0
+
+# -----
+def test_mem_profile_table():
+    """Unit-tests to verify one row per sort kernel and representation"""
+    rows = mem_profile_table(gen_values(100))
+    assert len(rows) == len(Sort_kernels) * len(get_repr_builders())
+    for (kernel_name, _, engine, peak_bytes, net_bytes) in rows:
+        assert peak_bytes >= net_bytes > 0
+        assert engine == (KEY_INT if kernel_name == KERNEL_RADIX else KEY_GENERIC)
+
+# -----
+def test_numpy_repr():
+    """Unit-tests to verify that radix sort handles the NumPy representation"""
+    # pylint: disable-next=import-outside-toplevel
+    import pytest
+    pytest.importorskip('numpy')
+
+    values = gen_values(200)
+    rep = make_numpy(values)
+    assert kernel_engine(KERNEL_RADIX, rep) == KEY_INT
+
+    # Radix sort must return the NumPy scalars, in the same order as the
+    # generic insertion sort, not Python ints decoded from its keys.
+    for asc in (True, False):
+        outlist = radix_sort(rep, asc)
+        assert all(isinstance(item, np.int64) for item in outlist)
+        assert outlist == insertion_sort(rep, asc)
+
+    rows = mem_profile_table(values)
+    numpy_rows = [row for row in rows if row[1] == REPR_NUMPY]
+    assert len(numpy_rows) == len(Sort_kernels)
+    for (kernel_name, _, engine, _, _) in numpy_rows:
+        assert engine == (KEY_INT if kernel_name == KERNEL_RADIX else KEY_GENERIC)
+
+###############################################################################
+# Start of the script: Execute only if run as a script
+###############################################################################
+if __name__ == "__main__":
+    main()